@@ -3,7 +3,6 @@
 # context
 import subprocess
 from contextlib import contextmanager
-from multiprocessing import Process
 from pathlib import Path
 from typing import Generator
 
@@ -330,12 +329,12 @@ class Test:
         directory: Path | str = Path("."),
         port: int | None = None,
         open_browser: bool = True,
-    ) -> Process:
+    ) -> subprocess.Popen:
         from fastled.open_browser import open_browser_process
 
         if isinstance(directory, str):
             directory = Path(directory)
-        proc: Process = open_browser_process(
+        proc: subprocess.Popen = open_browser_process(
             directory, port=port, open_browser=open_browser
         )
         return proc
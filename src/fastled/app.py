@@ -7,12 +7,12 @@ import sys
 import time
 from pathlib import Path
 
-from fastled.client_server import run_client, run_client_server
-from fastled.compile_server import CompileServer
 from fastled.parse_args import parse_args
 
 
 def run_server(args: argparse.Namespace) -> int:
+    from fastled.compile_server import CompileServer
+
     interactive = args.interactive
     auto_update = args.auto_update
     mapped_dir = Path(args.directory).absolute() if args.directory else None
@@ -44,6 +44,11 @@ def run_server(args: argparse.Namespace) -> int:
 
 def main() -> int:
     args = parse_args()
+    # Imported after parse_args so --version, --purge and --init exit without
+    # loading the client, docker and httpx.
+    from fastled.client_server import run_client, run_client_server
+    from fastled.compile_server import CompileServer
+
     if args.update:
         # Force auto_update to ensure update check happens
         compile_server = CompileServer(interactive=False, auto_updates=True)
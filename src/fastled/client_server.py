@@ -1,9 +1,9 @@
 import argparse
 import shutil
+import subprocess
 import tempfile
 import threading
 import time
-from multiprocessing import Process
 from pathlib import Path
 
 from fastled.compile_server import CompileServer
@@ -212,7 +212,7 @@ def run_client(
         if not result.success:
             print("\nCompilation failed.")
 
-        browser_proc: Process | None = None
+        browser_proc: subprocess.Popen | None = None
         if open_web_browser:
             browser_proc = open_browser_process(directory / "fastled_js")
         else:
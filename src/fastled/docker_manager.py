@@ -12,6 +12,7 @@ import time
 import traceback
 import warnings
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 import docker
@@ -115,8 +116,9 @@ class DockerManager:
         return self._client
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def is_docker_installed() -> bool:
-        """Check if Docker is installed on the system."""
+        """Check if Docker is installed on the system, probed once per process."""
         try:
             subprocess.run(["docker", "--version"], capture_output=True, check=True)
             print("Docker is installed.")
@@ -129,8 +131,9 @@ class DockerManager:
             return False
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def ensure_linux_containers_for_windows() -> bool:
-        """Ensure Docker is using Linux containers on Windows."""
+        """Ensure Docker is using Linux containers on Windows, checked once per process."""
         if sys.platform != "win32":
             return True  # Only needed on Windows
 
@@ -4,93 +4,118 @@ import select
 import sys
 import time
 from queue import Empty, Queue
-from threading import Thread
+from threading import Event, Thread
 
-_WHITE_SPACE = {" ", "\n", "\r"}  # Including Enter key as whitespace
+# The platform is known at import time, so resolve the console modules once
+# here rather than on every watcher thread start.
+if os.name == "nt":
+    import msvcrt
+else:
+    import termios
+    import tty
+
+# Space, Enter (CR and LF), compared against raw key bytes.
+_WHITE_SPACE = frozenset((0x20, 0x0D, 0x0A))
+_CTRL_C = 0x03
+
+
+def _poll_space_bar() -> bool:
+    """Non-blocking check of the input that is already buffered."""
+    found = False
+    if os.name == "nt":  # Windows
+        while msvcrt.kbhit():  # type: ignore
+            if msvcrt.getch()[0] in _WHITE_SPACE:  # type: ignore
+                found = True
+        return found
+    try:
+        if not sys.stdin.isatty():
+            return False
+        fd = sys.stdin.fileno()
+    except (OSError, ValueError):
+        return False
+    while select.select([fd], [], [], 0)[0]:
+        buf = os.read(fd, 1)
+        if not buf:
+            break
+        if buf[0] in _WHITE_SPACE:
+            found = True
+    return found
 
 
 class SpaceBarWatcher:
     @classmethod
     def watch_space_bar_pressed(cls, timeout: float = 0) -> bool:
+        if timeout <= 0:
+            # Not worth a watcher thread for a single poll.
+            return _poll_space_bar()
         watcher = cls()
         try:
-            start_time = time.time()
-            while True:
-                if watcher.space_bar_pressed():
-                    return True
-                if time.time() - start_time > timeout:
-                    return False
+            # The watcher thread only ever queues space bar presses, so block
+            # on the queue instead of spinning until the timeout expires.
+            watcher.queue.get(timeout=timeout)
+            return True
+        except Empty:
+            return False
         finally:
             watcher.stop()
 
     def __init__(self) -> None:
         self.queue: Queue = Queue()
-        self.queue_cancel: Queue = Queue()
+        self.cancel_event = Event()
+        # Resolved here so the worker thread is nothing but the poll loop.
+        self.fd: int | None = None
+        self.old_settings: list | None = None
+        if os.name != "nt":
+            try:
+                self.fd = sys.stdin.fileno()
+                self.old_settings = termios.tcgetattr(self.fd)  # type: ignore
+            except (OSError, ValueError, termios.error):  # type: ignore
+                # stdin is not a terminal, so there is nothing to watch.
+                self.fd = None
         self.process = Thread(target=self._watch_for_space, daemon=True)
         self.process.start()
 
     def _watch_for_space(self) -> None:
-        fd = sys.stdin.fileno()
         if os.name == "nt":  # Windows
-            import msvcrt
-
-            while True:
-                # Check for cancel signal
-                try:
-                    self.queue_cancel.get(timeout=0.1)
-                    break
-                except Empty:
-                    pass
-
+            # Waiting on the event doubles as the 100ms poll interval.
+            while not self.cancel_event.wait(0.1):
                 # Check if there's input ready
                 if msvcrt.kbhit():  # type: ignore
-                    char = msvcrt.getch().decode()  # type: ignore
-                    if char in _WHITE_SPACE:
+                    if msvcrt.getch()[0] in _WHITE_SPACE:  # type: ignore
                         self.queue.put(ord(" "))
-        else:  # Unix-like systems
-            import termios
-            import tty
-
-            old_settings = termios.tcgetattr(fd)  # type: ignore
+        elif self.fd is not None:  # Unix-like systems
+            fd = self.fd
             try:
                 tty.setcbreak(  # type: ignore
                     fd
                 )  # Use cbreak mode to avoid console issues # type: ignore
-                while True:
-                    # Check for cancel signal
-                    try:
-                        self.queue_cancel.get(timeout=0.1)
-                        break
-                    except Empty:
-                        pass
-
+                # select() below already provides the 100ms poll interval.
+                while not self.cancel_event.is_set():
                     # Check if there's input ready
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        char = sys.stdin.read(1)
-                        if ord(char) == 3:  # Ctrl+C
+                    if select.select([fd], [], [], 0.1)[0]:
+                        buf = os.read(fd, 1)
+                        if not buf:  # EOF
+                            break
+                        if buf[0] == _CTRL_C:
                             _thread.interrupt_main()
                             break
-                        if char in _WHITE_SPACE:
+                        if buf[0] in _WHITE_SPACE:
                             self.queue.put(ord(" "))
             finally:
                 termios.tcsetattr(  # type: ignore
-                    fd, termios.TCSADRAIN, old_settings  # type: ignore
+                    fd, termios.TCSADRAIN, self.old_settings  # type: ignore
                 )  # Restore terminal settings
 
     def space_bar_pressed(self) -> bool:
-        found = False
-        while not self.queue.empty():
-            try:
-                key = self.queue.get(block=False)
-                if key == ord(" "):  # Spacebar
-                    found = True
-                self.queue.task_done()
-            except Empty:
-                break
+        # Drain everything under a single lock acquisition instead of one
+        # get() per key press.
+        with self.queue.mutex:
+            found = ord(" ") in self.queue.queue
+            self.queue.queue.clear()
         return found
 
     def stop(self) -> None:
-        self.queue_cancel.put(True)
+        self.cancel_event.set()
         self.process.join()
 
 
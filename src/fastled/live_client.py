@@ -1,4 +1,5 @@
 import threading
+import warnings
 from pathlib import Path
 
 from fastled.compile_server import CompileServer
@@ -27,6 +28,7 @@ class LiveClient:
         self.auto_start = auto_start
         self.shutdown = threading.Event()
         self.thread: threading.Thread | None = None
+        self._url: str | None = None
         if auto_start:
             self.start()
 
@@ -48,13 +50,16 @@ class LiveClient:
     def url(self) -> str:
         """Get the URL of the server."""
         if isinstance(self.host, CompileServer):
+            # Not cached, the server's port is only known while it runs.
             return self.host.url()
+        if self._url is not None:
+            return self._url
         if self.host is None:
-            import warnings
-
             warnings.warn("TODO: use the actual host.")
-            return "http://localhost:9021"
-        return self.host
+            self._url = "http://localhost:9021"
+        else:
+            self._url = self.host
+        return self._url
 
     @property
     def running(self) -> bool:
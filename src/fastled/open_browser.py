@@ -1,137 +1,235 @@
+import shutil
+import socket
 import subprocess
 import sys
+import threading
 import time
 import webbrowser
-from multiprocessing import Process
+from functools import lru_cache
 from pathlib import Path
 
+import httpx
+
 DEFAULT_PORT = 8089  # different than live version.
 
 PYTHON_EXE = sys.executable
 
+# Set once an npm install has been started in this process.
+_npm_install_started = False
+_NPM_INSTALL_LOCK = threading.Lock()
 
-def open_http_server_subprocess(
-    fastled_js: Path, port: int, open_browser: bool
-) -> None:
-    """Start livereload server in the fastled_js directory and return the process"""
-    import shutil
 
-    try:
-        if shutil.which("live-server") is not None:
-            cmd = [
-                "live-server",
-                f"--port={port}",
-                "--host=localhost",
-                ".",
-            ]
-            if not open_browser:
-                cmd.append("--no-browser")
-            subprocess.run(cmd, shell=True, cwd=fastled_js)
+@lru_cache(maxsize=1)
+def _live_server_path() -> str | None:
+    """Location of live-server, searched on PATH only once per process."""
+    return shutil.which("live-server")
+
+
+class _ProcessTree(subprocess.Popen):
+    """Popen whose kill() and terminate() also stop the children on Windows."""
+
+    def kill(self) -> None:
+        if sys.platform == "win32" and self.poll() is None:
+            # live-server resolves to live-server.CMD, which CreateProcess runs
+            # through cmd.exe. Killing only that pid would leave node serving.
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(self.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
             return
+        super().kill()
+
+    def terminate(self) -> None:
+        if sys.platform == "win32":
+            self.kill()
+            return
+        super().terminate()
+
 
+def open_http_server_subprocess(
+    fastled_js: Path, port: int, open_browser: bool
+) -> subprocess.Popen:
+    """Serve fastled_js with live-server, or the stdlib preview server if it is missing"""
+    live_server = _live_server_path()
+    if live_server is not None:
+        # Launch the resolved executable directly. Passing a list with
+        # shell=True drops every argument after the first on POSIX.
         cmd = [
-            PYTHON_EXE,
-            "-m",
-            "fastled.open_browser2",
-            str(fastled_js),
-            "--port",
-            str(port),
+            live_server,
+            f"--port={port}",
+            "--host=localhost",
+            ".",
         ]
-        # return subprocess.Popen(cmd)  # type ignore
-        # pipe stderr and stdout to null
-        subprocess.run(
+        if not open_browser:
+            cmd.append("--no-browser")
+        return _ProcessTree(
             cmd,
+            cwd=fastled_js,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
-        )  # type ignore
-    except KeyboardInterrupt:
-        import _thread
+        )
 
-        _thread.interrupt_main()
+    cmd = [
+        PYTHON_EXE,
+        "-m",
+        "fastled.open_browser2",
+        str(fastled_js),
+        "--port",
+        str(port),
+    ]
+    # pipe stderr and stdout to null
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
 
-def is_port_free(port: int) -> bool:
-    """Check if a port is free"""
-    import httpx
+@lru_cache(maxsize=1)
+def _browser() -> webbrowser.BaseBrowser:
+    """The default browser controller, probed for only once per process."""
+    return webbrowser.get()
+
 
+def _open_url(url: str) -> None:
     try:
-        response = httpx.get(f"http://localhost:{port}", timeout=1)
-        response.raise_for_status()
+        _browser().open_new_tab(url)
+    except webbrowser.Error as e:
+        print(f"Could not open a browser: {e}")
+
+
+def _is_listening(port: int) -> bool:
+    """Check if something accepts TCP connections on localhost:port."""
+    # create_connection() tries every address localhost resolves to, the
+    # same way httpx does, so a server bound to ::1 only is found too.
+    try:
+        with socket.create_connection(("localhost", port), timeout=0.05):
+            return True
+    except OSError:
         return False
-    except (httpx.HTTPError, httpx.ConnectError):
-        return True
+
+
+def is_port_free(port: int) -> bool:
+    """Check if a port is free"""
+    # A refused TCP connect is enough, there is no need to speak HTTP.
+    return not _is_listening(port)
+
+
+def _can_bind(port: int) -> bool:
+    """Check if a port can be bound on localhost."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        if sys.platform.startswith("linux"):
+            # Match the server's own bind so a port left in TIME_WAIT by a
+            # previous preview counts as free. Elsewhere SO_REUSEADDR also
+            # lets the bind succeed on a port another process is serving:
+            # any port on Windows, next to a wildcard listener on macOS/BSD.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(("localhost", port))
+            return True
+        except OSError:
+            return False
 
 
 def find_free_port(start_port: int) -> int:
-    """Find a free port starting at start_port"""
-    for port in range(start_port, start_port + 100):
-        if is_port_free(port):
-            print(f"Found free port: {port}")
-            return port
-        else:
-            print(f"Port {port} is in use, finding next")
-    raise ValueError("Could not find a free port")
+    """Find a free port, preferring start_port"""
+    if _can_bind(start_port):
+        print(f"Found free port: {start_port}")
+        return start_port
+    # Let the kernel hand out a free ephemeral port instead of scanning.
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("localhost", 0))
+        port: int = sock.getsockname()[1]
+    print(f"Port {start_port} is in use, using port {port}")
+    return port
 
 
 def wait_for_server(port: int, timeout: int = 10) -> None:
     """Wait for the server to start."""
-    from httpx import get
-
-    future_time = time.time() + timeout
-    while future_time > time.time():
-        try:
-            response = get(f"http://localhost:{port}", timeout=1)
-            if response.status_code == 200:
-                return
-        except Exception:
-            continue
+    delay = 0.001
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        # Only issue the HTTP request once something accepts connections.
+        if _is_listening(port):
+            try:
+                response = httpx.get(f"http://localhost:{port}", timeout=1)
+                if response.status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
     raise TimeoutError("Could not connect to server")
 
 
 def _background_npm_install_live_server() -> None:
-    import shutil
-    import time
-
-    if shutil.which("npm") is None:
+    global _npm_install_started
+    npm = shutil.which("npm")
+    if npm is None:
         return
 
-    if shutil.which("live-server") is not None:
+    if _live_server_path() is not None:
         return
 
-    time.sleep(3)
+    # npm resolves the whole dependency tree even when it ends up doing
+    # nothing, so try at most once per process, whatever the outcome.
+    with _NPM_INSTALL_LOCK:
+        if _npm_install_started:
+            return
+        _npm_install_started = True
+
+    cmd = [
+        npm,
+        "install",
+        "-g",
+        "live-server",
+        "--prefer-offline",
+        "--no-audit",
+        "--no-fund",
+        "--no-progress",
+        "--loglevel=error",
+    ]
+    # Run at the lowest priority instead of sleeping first, so the install
+    # only gets the CPU the preview server isn't using.
+    creationflags = 0
+    if sys.platform == "win32":
+        creationflags = subprocess.IDLE_PRIORITY_CLASS
+    elif shutil.which("nice") is not None:
+        cmd = ["nice", "-n", "19"] + cmd
     subprocess.run(
-        ["npm", "install", "-g", "live-server"],
+        cmd,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
+        creationflags=creationflags,
     )
+    # Pick up the freshly installed live-server on the next preview.
+    _live_server_path.cache_clear()
 
 
 def open_browser_process(
     fastled_js: Path, port: int | None = None, open_browser: bool = True
-) -> Process:
-    import shutil
-
-    """Start livereload server in the fastled_js directory and return the process"""
+) -> subprocess.Popen:
+    """Start the preview server for fastled_js, open a browser and return the server process"""
     if port is not None:
         if not is_port_free(port):
             raise ValueError(f"Port {port} was specified but in use")
     else:
         port = find_free_port(DEFAULT_PORT)
-    out: Process = Process(
-        target=open_http_server_subprocess,
-        args=(fastled_js, port, False),
-        daemon=True,
-    )
-    out.start()
-    wait_for_server(port)
+    # The server is launched directly, there is no intermediate Python
+    # process whose only job would be to wait on it.
+    out = open_http_server_subprocess(fastled_js, port, open_browser=False)
+    try:
+        wait_for_server(port)
+    except BaseException:
+        out.kill()
+        raise
     if open_browser:
         print(f"Opening browser to http://localhost:{port}")
-        webbrowser.open(url=f"http://localhost:{port}", new=1, autoraise=True)
+        _open_url(f"http://localhost:{port}")
 
     # start a deamon thread to install live-server
-    if shutil.which("live-server") is None:
-        import threading
-
+    if _live_server_path() is None:
         t = threading.Thread(target=_background_npm_install_live_server)
         t.daemon = True
         t.start()
@@ -158,4 +256,4 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     proc = open_browser_process(args.fastled_js, args.port, open_browser=True)
-    proc.join()
+    proc.wait()
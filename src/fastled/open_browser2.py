@@ -1,84 +1,249 @@
+import _thread
 import argparse
+import gzip
+import io
+import os
+import stat
+import sys
+import warnings
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
-from livereload import Server
+# File extension -> Content-Type, looked up once per request.
+MAPPING = {
+    "js": "application/javascript",
+    "css": "text/css",
+    "wasm": "application/wasm",
+    "json": "application/json",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "svg": "image/svg+xml",
+    "ico": "image/x-icon",
+    "html": "text/html",
+}
 
+_NO_CACHE_HEADERS = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
+# The same headers, serialized once in the form send_header() buffers them.
+_NO_CACHE_BLOB = "".join(
+    f"{key}: {value}\r\n" for key, value in _NO_CACHE_HEADERS.items()
+).encode("latin-1")
+# Static assets may be cached but must be revalidated against their ETag.
+# They can't be immutable: every compile rewrites fastled.wasm and friends
+# under the same names.
+_REVALIDATE_BLOB = b"Cache-Control: no-cache\r\n"
 
-def _run_flask_server(fastled_js: Path, port: int) -> None:
-    """Run Flask server with live reload in a subprocess"""
+# The compiled wasm and its js glue shrink several fold with gzip.
+_GZIP_EXTENSIONS = frozenset((".wasm", ".js"))
+_VARY_BLOB = b"Vary: Accept-Encoding\r\n"
+# path -> (mtime_ns, size, gzipped body), reused until a compile rewrites it.
+_gzip_cache: dict[str, tuple[int, int, bytes]] = {}
+
+
+def _gzipped(path: str, st: os.stat_result) -> bytes:
+    cached = _gzip_cache.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    with open(path, "rb") as f:
+        body = gzip.compress(f.read(), compresslevel=6)
+    _gzip_cache[path] = (st.st_mtime_ns, st.st_size, body)
+    return body
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Check an Accept-Encoding header for gzip, honouring q=0 refusals."""
+    qualities: dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    # An explicit gzip entry wins over the "*" wildcard.
+    quality = qualities.get("gzip", qualities.get("*", 0.0))
+    return quality > 0
+
+
+# Live reload: html pages poll this endpoint and reload when index.html is
+# rewritten by a new compile.
+_RELOAD_PATH = "/__reload"
+_RELOAD_SCRIPT = (
+    b"<script>(function(){var v=null;setInterval(function(){"
+    b'fetch("' + _RELOAD_PATH.encode() + b'",{cache:"no-store"})'
+    b".then(function(r){return r.ok?r.text():null;})"
+    b".then(function(t){if(t===null)return;"
+    b"if(v!==null&&t!==v){location.reload();}v=t;})"
+    b".catch(function(){});},1000);})();</script>"
+)
+_HEAD_END = b"</head>"
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    """Static file handler with forced mime types, no caching and live reload."""
+
+    # Keep connections alive so a page load doesn't pay a TCP handshake per
+    # asset. Every response with a body carries a Content-Length.
+    protocol_version = "HTTP/1.1"
+
+    # Cache headers for the current response, swapped per request below.
+    # The default also covers errors sent before parse_request() runs.
+    _cache_headers = _NO_CACHE_BLOB
+
+    # Some systems don't have the right mime types in their registry.
+    extensions_map = {
+        **SimpleHTTPRequestHandler.extensions_map,
+        **{f".{ext}": content_type for ext, content_type in MAPPING.items()},
+    }
+
+    def parse_request(self) -> bool:
+        # Connections are kept alive, so reset the per request state here.
+        self._cache_headers = _NO_CACHE_BLOB
+        return super().parse_request()
+
+    def send_error(self, code, message=None, explain=None) -> None:
+        # Error pages are never cached, drop any ETag set for the file.
+        self._cache_headers = _NO_CACHE_BLOB
+        super().send_error(code, message, explain)
+
+    def end_headers(self) -> None:
+        if self.request_version != "HTTP/0.9":
+            self._headers_buffer.append(self._cache_headers)  # type: ignore
+        super().end_headers()
+
+    def copyfile(self, source, outputfile) -> None:
+        # The headers are already flushed to the unbuffered wfile, so hand
+        # the body to the kernel with sendfile(). socket.sendfile() falls
+        # back to plain sends for in-memory pages and where it's unsupported.
+        self.connection.sendfile(source)
+
+    def do_GET(self) -> None:
+        if self.path == _RELOAD_PATH:
+            self._send_reload_version()
+            return
+        super().do_GET()
+
+    def _send_reload_version(self) -> None:
+        index_html = os.path.join(self.directory, "index.html")
+        try:
+            body = str(os.stat(index_html).st_mtime_ns).encode()
+        except OSError:
+            # Mid-compile, the output directory is being replaced.
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            return self._send_html(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return super().send_head()
+        if stat.S_ISREG(st.st_mode):
+            compressible = os.path.splitext(path)[1] in _GZIP_EXTENSIONS
+            use_gzip = compressible and _accepts_gzip(
+                self.headers.get("Accept-Encoding", "")
+            )
+            # Each encoding is a different representation with its own ETag.
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-gz" if use_gzip else ""}"'
+            self._cache_headers = _REVALIDATE_BLOB + f"ETag: {etag}\r\n".encode()
+            if compressible:
+                self._cache_headers += _VARY_BLOB
+            if_none_match = self.headers.get("If-None-Match", "")
+            if etag in (tag.strip() for tag in if_none_match.split(",")):
+                self.send_response(304)
+                self.end_headers()
+                return None
+            if use_gzip:
+                return self._send_gzipped(path, st)
+        return super().send_head()
+
+    def _send_gzipped(self, path: str, st: os.stat_result) -> io.BytesIO | None:
+        if self.command == "HEAD":
+            # Report the encoding without compressing the whole file just to
+            # learn its length, a HEAD response carries no body anyway.
+            self.send_response(200)
+            self.send_header("Content-Type", self.guess_type(path))
+            self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            return None
+        try:
+            body = _gzipped(path, st)
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def _send_html(self, path: str) -> io.BytesIO | None:
+        # Pages get the live reload script and are never cached.
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        body = body.replace(_HEAD_END, _RELOAD_SCRIPT + _HEAD_END, 1)
+        self.send_response(200)
+        self.send_header("Content-Type", MAPPING["html"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return io.BytesIO(body)
+
+
+class _Server(ThreadingHTTPServer):
+    # Rebind right away over a port left in TIME_WAIT by the previous
+    # preview, the same rule open_browser.find_free_port probes with. Only
+    # on Linux, where SO_REUSEADDR covers nothing but TIME_WAIT: on Windows
+    # it allows binding a port in use, and on macOS/BSD a 127.0.0.1 bind
+    # next to a wildcard listener.
+    allow_reuse_address = sys.platform.startswith("linux")
+    # Never share the port with a live server, requests would be split
+    # between the old and the new preview.
+    allow_reuse_port = False
+
+
+def _run_http_server(fastled_js: Path, port: int) -> None:
+    """Run the http server with live reload in a subprocess"""
     try:
-        from flask import Flask, send_from_directory
-
-        app = Flask(__name__)
-
-        # Must be a full path or flask will fail to find the file.
-        fastled_js = fastled_js.resolve()
-
-        @app.route("/")
-        def serve_index():
-            return send_from_directory(fastled_js, "index.html")
-
-        @app.route("/<path:path>")
-        def serve_files(path):
-            response = send_from_directory(fastled_js, path)
-            # Some servers don't set the Content-Type header for a bunch of files.
-            if path.endswith(".js"):
-                response.headers["Content-Type"] = "application/javascript"
-            if path.endswith(".css"):
-                response.headers["Content-Type"] = "text/css"
-            if path.endswith(".wasm"):
-                response.headers["Content-Type"] = "application/wasm"
-            if path.endswith(".json"):
-                response.headers["Content-Type"] = "application/json"
-            if path.endswith(".png"):
-                response.headers["Content-Type"] = "image/png"
-            if path.endswith(".jpg"):
-                response.headers["Content-Type"] = "image/jpeg"
-            if path.endswith(".jpeg"):
-                response.headers["Content-Type"] = "image/jpeg"
-            if path.endswith(".gif"):
-                response.headers["Content-Type"] = "image/gif"
-            if path.endswith(".svg"):
-                response.headers["Content-Type"] = "image/svg+xml"
-            if path.endswith(".ico"):
-                response.headers["Content-Type"] = "image/x-icon"
-            if path.endswith(".html"):
-                response.headers["Content-Type"] = "text/html"
-
-            # now also add headers to force no caching
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-            return response
-
-        server = Server(app.wsgi_app)
-        # Watch index.html for changes
-        server.watch(str(fastled_js / "index.html"))
-        # server.watch(str(fastled_js / "index.js"))
-        # server.watch(str(fastled_js / "index.css"))
-        # Start the server
-        server.serve(port=port, debug=True)
+        handler = partial(_Handler, directory=str(fastled_js.resolve()))
+        with _Server(("127.0.0.1", port), handler) as server:
+            server.serve_forever()
     except KeyboardInterrupt:
-        import _thread
-
         _thread.interrupt_main()
     except Exception as e:
-        print(f"Failed to run Flask server: {e}")
-        import _thread
-
+        print(f"Failed to run http server: {e}")
         _thread.interrupt_main()
 
 
 def run(path: Path, port: int) -> None:
-    """Run the Flask server."""
+    """Run the http server."""
     try:
-        _run_flask_server(path, port)
-        import warnings
-
-        warnings.warn("Flask server has stopped")
+        _run_http_server(path, port)
+        warnings.warn("Http server has stopped")
     except KeyboardInterrupt:
-        import _thread
-
         _thread.interrupt_main()
         pass
 
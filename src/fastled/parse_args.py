@@ -1,21 +1,81 @@
 import argparse
 import os
 import sys
+from enum import Enum
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, NoReturn
 
 from fastled import __version__
-from fastled.project_init import project_init
-from fastled.select_sketch_directory import select_sketch_directory
-from fastled.settings import DEFAULT_URL, IMAGE_NAME
-from fastled.sketch import (
-    find_sketch_directories,
-    looks_like_fastled_repo,
-    looks_like_sketch_directory,
+
+
+class _CompilerChoice(Enum):
+    AS_GIVEN = "AS_GIVEN"  # the flags already name the compiler
+    FORCE_LOCAL = "FORCE_LOCAL"  # running inside the FastLED repo
+    PROBE_DOCKER = "PROBE_DOCKER"  # nothing given, use docker if available
+
+
+def _resolve_compiler(
+    web: bool, localhost: bool, server: bool, cwd_is_fastled: bool
+) -> _CompilerChoice:
+    """Decide how the compiler gets picked from the command line flags."""
+    if web or server:
+        return _CompilerChoice.AS_GIVEN
+    if cwd_is_fastled:
+        return _CompilerChoice.FORCE_LOCAL
+    if localhost:
+        return _CompilerChoice.AS_GIVEN
+    return _CompilerChoice.PROBE_DOCKER
+
+
+def _purge() -> NoReturn:
+    from fastled.docker_manager import DockerManager
+    from fastled.settings import IMAGE_NAME
+
+    docker = DockerManager()
+    docker.purge(IMAGE_NAME)
+    sys.exit(0)
+
+
+def _handle_purge(args: argparse.Namespace) -> NoReturn:
+    _purge()
+
+
+def _handle_init(args: argparse.Namespace) -> NoReturn:
+    from fastled.project_init import project_init
+
+    example = args.init if args.init is not True else None
+    try:
+        args.directory = project_init(example, args.directory)
+    except Exception as e:
+        print(f"Failed to initialize project: {e}")
+        sys.exit(1)
+    print("\nInitialized FastLED project in", args.directory)
+    print(f"Use 'fastled {args.directory}' to compile the project.")
+    sys.exit(0)
+
+
+def _handle_build(args: argparse.Namespace) -> argparse.Namespace:
+    # The image is built by the caller, nothing else needs resolving.
+    return args
+
+
+# Flags that end argument processing early, checked in this order.
+_EARLY_ACTIONS: tuple[
+    tuple[str, Callable[[argparse.Namespace], argparse.Namespace]], ...
+] = (
+    ("purge", _handle_purge),
+    ("init", _handle_init),
+    ("build", _handle_build),
 )
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command-line arguments."""
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    # Each parse_args() call returns a fresh Namespace, so one parser can
+    # be shared by every call in the process.
+    from fastled.settings import DEFAULT_URL
+
     parser = argparse.ArgumentParser(description=f"FastLED WASM Compiler {__version__}")
     parser.add_argument("--version", action="version", version=f"{__version__}")
     parser.add_argument(
@@ -97,42 +157,44 @@ def parse_args() -> argparse.Namespace:
         help="Remove all FastLED containers and images",
     )
 
-    build_mode = parser.add_mutually_exclusive_group()
-    build_mode.add_argument("--debug", action="store_true", help="Build in debug mode")
-    build_mode.add_argument(
+    # The build modes are mutually exclusive, checked by hand in parse_args()
+    # rather than through an argparse group.
+    parser.add_argument("--debug", action="store_true", help="Build in debug mode")
+    parser.add_argument(
         "--quick",
         action="store_true",
-        default=True,
         help="Build in quick mode (default)",
     )
-    build_mode.add_argument(
-        "--release", action="store_true", help="Build in release mode"
-    )
+    parser.add_argument("--release", action="store_true", help="Build in release mode")
+    return parser
 
-    cwd_is_fastled = looks_like_fastled_repo(Path(os.getcwd()))
 
-    args = parser.parse_args()
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    # Answer the trivial invocations without building the parser.
+    argv = sys.argv[1:]
+    if argv == ["--version"]:
+        print(__version__)
+        sys.exit(0)
+    if argv == ["--purge"]:
+        _purge()
 
-    if args.purge:
-        from fastled.docker_manager import DockerManager
+    parser = _build_parser()
+    args = parser.parse_args()
+    if args.debug + args.quick + args.release > 1:
+        parser.error("--debug, --quick and --release are mutually exclusive")
+    args.quick = not (args.debug or args.release)
 
-        docker = DockerManager()
-        docker.purge(IMAGE_NAME)
-        sys.exit(0)
+    for flag, handler in _EARLY_ACTIONS:
+        if getattr(args, flag):
+            return handler(args)
 
-    if args.init:
-        example = args.init if args.init is not True else None
-        try:
-            args.directory = project_init(example, args.directory)
-        except Exception as e:
-            print(f"Failed to initialize project: {e}")
-            sys.exit(1)
-        print("\nInitialized FastLED project in", args.directory)
-        print(f"Use 'fastled {args.directory}' to compile the project.")
-        sys.exit(0)
+    # Only probed once the early exits above are out of the way.
+    from fastled.settings import DEFAULT_URL
+    from fastled.sketch import looks_like_fastled_repo, looks_like_sketch_directory
 
-    if args.build:
-        return args
+    cwd = os.getcwd()
+    cwd_is_fastled = looks_like_fastled_repo(cwd)
 
     if not args.update:
         if args.no_auto_updates:
@@ -140,12 +202,10 @@ def parse_args() -> argparse.Namespace:
         else:
             args.auto_update = None
 
-        if (
-            not cwd_is_fastled
-            and not args.localhost
-            and not args.web
-            and not args.server
-        ):
+        choice = _resolve_compiler(
+            bool(args.web), args.localhost, args.server, cwd_is_fastled
+        )
+        if choice is _CompilerChoice.PROBE_DOCKER:
             from fastled.docker_manager import DockerManager
 
             if DockerManager.is_docker_installed():
@@ -162,7 +222,7 @@ def parse_args() -> argparse.Namespace:
             else:
                 print(f"Docker is not installed. Using web compiler at {DEFAULT_URL}.")
                 args.web = DEFAULT_URL
-        if cwd_is_fastled and not args.web and not args.server:
+        elif choice is _CompilerChoice.FORCE_LOCAL:
             print("Forcing --local mode because we are in the FastLED repo")
             args.localhost = True
         if args.localhost:
@@ -172,12 +232,14 @@ def parse_args() -> argparse.Namespace:
             args.server = True
         if args.directory is None and not args.server:
             # does current directory look like a sketch?
-            maybe_sketch_dir = Path(os.getcwd())
-            if looks_like_sketch_directory(maybe_sketch_dir):
-                args.directory = str(maybe_sketch_dir)
+            if looks_like_sketch_directory(Path(cwd)):
+                args.directory = cwd
             else:
+                from fastled.select_sketch_directory import select_sketch_directory
+                from fastled.sketch import find_sketch_directories
+
                 print("Searching for sketch directories...")
-                sketch_directories = find_sketch_directories(maybe_sketch_dir)
+                sketch_directories = find_sketch_directories(Path(cwd))
                 selected_dir = select_sketch_directory(
                     sketch_directories, cwd_is_fastled
                 )
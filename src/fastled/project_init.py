@@ -2,6 +2,7 @@ import _thread
 import threading
 import time
 import zipfile
+from functools import lru_cache
 from pathlib import Path
 
 import httpx
@@ -13,12 +14,17 @@ DEFAULT_EXAMPLE = "wasm"
 
 
 def get_examples(host: str | None = None) -> list[str]:
-    host = host or DEFAULT_URL
+    return list(_fetch_examples(host or DEFAULT_URL))
+
+
+@lru_cache(maxsize=8)
+def _fetch_examples(host: str) -> tuple[str, ...]:
+    """The example catalog only changes with a server deploy, fetch it once per host."""
     url_info = f"{host}/info"
     response = httpx.get(url_info, timeout=4)
     response.raise_for_status()
     examples: list[str] = response.json()["examples"]
-    return sorted(examples)
+    return tuple(sorted(examples))
 
 
 def _prompt_for_example() -> str:
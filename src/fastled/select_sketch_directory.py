@@ -1,3 +1,4 @@
+import sys
 from pathlib import Path
 
 from fastled.string_diff import string_diff_paths
@@ -20,6 +21,10 @@ def select_sketch_directory(
         print("\nMultiple Directories found, choose one:")
         for i, sketch_dir in enumerate(sketch_directories):
             print(f"  [{i+1}]: {sketch_dir}")
+        if not (sys.stdin and sys.stdin.isatty()):
+            # Nobody can answer the prompt, input() would block or hit EOF.
+            print("\nNot running in a terminal, cannot prompt for a choice.")
+            return None
         which = input("\nPlease specify a sketch directory: ").strip()
         try:
             index = int(which) - 1
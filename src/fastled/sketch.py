@@ -1,17 +1,24 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 
 _MAX_FILES_SEARCH_LIMIT = 10000
+# Build output and tool directories that never hold a sketch.
+_SKIP_DIRS = frozenset(("fastled_js", "node_modules", "__pycache__"))
+_SKETCH_SUFFIXES = (".ino", ".cpp")
 
 
 def find_sketch_directories(directory: Path) -> list[Path]:
     file_count = 0
     sketch_directories: list[Path] = []
-    # search all the paths one level deep
-    for path in directory.iterdir():
-        if path.is_dir():
-            dir_name = path.name
-            if str(dir_name).startswith("."):
+    # search all the paths one level deep, scandir() already knows which
+    # entries are directories so there is no stat per entry.
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            dir_name = entry.name
+            if dir_name.startswith(".") or dir_name in _SKIP_DIRS:
+                continue
+            if not entry.is_dir():
                 continue
             file_count += 1
             if file_count > _MAX_FILES_SEARCH_LIMIT:
@@ -20,13 +27,16 @@ def find_sketch_directories(directory: Path) -> list[Path]:
                 )
                 break
 
+            path = Path(entry.path)
             if looks_like_sketch_directory(path, quick=True):
                 sketch_directories.append(path)
             if dir_name.lower() == "examples":
-                for example in path.iterdir():
-                    if example.is_dir():
-                        if looks_like_sketch_directory(example, quick=True):
-                            sketch_directories.append(example)
+                with os.scandir(path) as examples:
+                    for example in examples:
+                        if example.is_dir():
+                            example_path = Path(example.path)
+                            if looks_like_sketch_directory(example_path, quick=True):
+                                sketch_directories.append(example_path)
     # make relative to cwd
     sketch_directories = [p.relative_to(directory) for p in sketch_directories]
     return sketch_directories
@@ -60,11 +70,21 @@ def get_sketch_files(directory: Path) -> list[Path]:
     return files
 
 
-def looks_like_fastled_repo(directory: Path) -> bool:
-    libprops = directory / "library.properties"
-    if not libprops.exists():
+def looks_like_fastled_repo(directory: str | os.PathLike) -> bool:
+    # Keyed on the absolute path so "." and the cwd share one cache entry.
+    return _looks_like_fastled_repo(os.path.abspath(directory))
+
+
+@lru_cache(maxsize=64)
+def _looks_like_fastled_repo(directory: str) -> bool:
+    libprops = os.path.join(directory, "library.properties")
+    # Open straight away, a missing file costs the same failed syscall a
+    # separate exists() check would.
+    try:
+        with open(libprops, encoding="utf-8", errors="ignore") as f:
+            txt = f.read()
+    except OSError:
         return False
-    txt = libprops.read_text(encoding="utf-8", errors="ignore")
     return "FastLED" in txt
 
 
@@ -85,13 +105,14 @@ def looks_like_sketch_directory(directory: Path, quick=False) -> bool:
     # at the root of the directory there should either be an ino file or a src directory
     # or some cpp files
     # if there is a platformio.ini file, return True
-    ino_file_at_root = list(directory.glob("*.ino"))
-    if ino_file_at_root:
-        return True
-    cpp_file_at_root = list(directory.glob("*.cpp"))
-    if cpp_file_at_root:
-        return True
-    platformini_file = list(directory.glob("platformio.ini"))
-    if platformini_file:
-        return True
+    # One pass over the entries that stops at the first match, instead of a
+    # full glob per pattern. normcase keeps glob's case folding on Windows.
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = os.path.normcase(entry.name)
+                if name.endswith(_SKETCH_SUFFIXES) or name == "platformio.ini":
+                    return True
+    except OSError:
+        pass
     return False
@@ -2,12 +2,18 @@
 Unit test file.
 """
 
+import tempfile
+import threading
 import unittest
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
+from typing import Iterator
 
 import httpx
 
 from fastled import Test
+from fastled.open_browser2 import _Handler, _Server
 
 HERE = Path(__file__).parent
 INDEX_HTML = HERE / "html" / "index.html"
@@ -16,6 +22,22 @@ TIMEOUT = 120
 assert INDEX_HTML.exists()
 
 
+@contextmanager
+def _serve_in_process(directory: Path) -> Iterator[str]:
+    """Serve directory with the stdlib preview server, yield its base url."""
+    # Test.spawn_http_server prefers live-server when it is on PATH, which
+    # has neither the live reload endpoint nor gzip/ETag support.
+    handler = partial(_Handler, directory=str(directory))
+    with _Server(("127.0.0.1", 0), handler) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_address[1]}"
+        finally:
+            server.shutdown()
+            thread.join()
+
+
 class HttpServerTester(unittest.TestCase):
     """Main tester class."""
 
@@ -26,6 +48,52 @@ class HttpServerTester(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         proc.terminate()
 
+    def test_live_reload(self) -> None:
+        """Test that html pages poll the server for a new index.html."""
+        with _serve_in_process(INDEX_HTML.parent) as base_url:
+            response = httpx.get(base_url, timeout=1)
+            self.assertIn("/__reload", response.text)
+            response = httpx.get(f"{base_url}/__reload", timeout=1)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.text, str(INDEX_HTML.stat().st_mtime_ns))
+
+    def test_gzip_and_etag(self) -> None:
+        """Test gzip negotiation and conditional GETs on the stdlib server."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data = b"\0asm" * 10000
+            (Path(tmpdir) / "fastled.wasm").write_bytes(data)
+            with (
+                _serve_in_process(Path(tmpdir)) as base_url,
+                httpx.Client(timeout=1) as client,
+            ):
+                url = f"{base_url}/fastled.wasm"
+                response = client.get(url, headers={"Accept-Encoding": "gzip"})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.headers["Content-Encoding"], "gzip")
+                self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+                # httpx decodes the body according to Content-Encoding.
+                self.assertEqual(response.content, data)
+                gzip_etag = response.headers["ETag"]
+
+                response = client.get(url, headers={"Accept-Encoding": "identity"})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("Content-Encoding", response.headers)
+                self.assertEqual(response.content, data)
+                self.assertNotEqual(response.headers["ETag"], gzip_etag)
+
+                # q=0 is an explicit refusal, not an offer.
+                response = client.get(url, headers={"Accept-Encoding": "gzip;q=0"})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("Content-Encoding", response.headers)
+                self.assertEqual(response.content, data)
+
+                response = client.get(
+                    url,
+                    headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag},
+                )
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+
 
 if __name__ == "__main__":
     unittest.main()